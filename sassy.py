@@ -13,7 +13,7 @@ from os.path import basename
 from sys import argv
 from textwrap import dedent
 
-from src import MessageService, RepoProvider, Sassy, get_version
+from src import RepoProvider, Sassy, get_message_service, get_version
 
 
 class Parser:
@@ -80,7 +80,7 @@ def main():
     """Execute the main function."""
     try:
         args = Parser()()
-        message = MessageService()
+        message = get_message_service()
         repo = RepoProvider()
 
         if args.create:
@@ -1,6 +1,44 @@
 """Setuptools for package registry."""
 import typing as _t
+from os.path import join
+from pprint import pformat
+
 from setuptools import setup, find_packages
+from setuptools.command.build_py import build_py
+
+
+class BuildPy(build_py):
+    """Build modules and ship the YAML datasets pre-parsed as modules."""
+
+    # YAML file, generated module and its constant
+    GENERATED = (
+        ('sassy.yml', '_sassy_config.py', 'CONFIG'),
+        ('messages.yml', '_sassy_messages.py', 'MESSAGES'),
+    )
+
+    def run(self):
+        """Build modules then generate the pre-parsed dataset modules."""
+        super().run()
+
+        try:
+            from yaml import safe_load
+        except ImportError as exc:
+            raise RuntimeError(
+                'PyYAML is required to build sassy, see pyproject.toml'
+            ) from exc
+
+        for yaml_file, module, constant in self.GENERATED:
+            with open(join('src', yaml_file), 'rb') as f:
+                dataset = safe_load(f)
+
+            target = join(self.build_lib, 'src', module)
+
+            # Keep the YAML key order, sassy walks these datasets in order
+            with open(target, 'w', encoding='utf-8') as f:
+                f.write(f'"""Generated from {yaml_file} by setup.py."""\n')
+                f.write(
+                    f'{constant} = {pformat(dataset, sort_dicts=False)}\n')
+
 
 with open('README.md', 'r') as readme_file:
     readme = readme_file.read()
@@ -27,6 +65,7 @@ setup(
         '': ['VERSION', 'README.md', 'CHANGE.md', 'LICENSE', 'AUTHORS.md'],
     },
     install_requires=requirements,
+    cmdclass={'build_py': BuildPy},
     entry_points={
         'console_scripts': [
             'sassy = sassy:main',
@@ -21,26 +21,68 @@ Contact:
 """
 import logging
 import logging.config
+import re
 from abc import abstractmethod, ABC
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from enum import Enum
-from functools import wraps
-from os.path import abspath
+from functools import lru_cache, wraps
+from os import O_CREAT, O_EXCL, O_TRUNC, O_WRONLY, close, cpu_count, \
+    environ, getcwd, open as os_open, scandir, stat, write
+from os.path import abspath, join, normpath
 from pathlib import Path
-from typing import Optional, Any, Dict, Union, List
+from sys import version_info
+from typing import Optional, Any, Dict, FrozenSet, Iterable, Iterator, \
+    Pattern, Set, Tuple, Union, List
 
 from git import BaseIndexEntry, Repo
-from yaml import load, Loader
+from yaml import load
 from yaml.parser import ParserError
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+try:
+    from os import writev
+except ImportError:
+    # Not available on Windows
+    writev = None
+
+try:
+    # Generated from sassy.yml at build time, see setup.py
+    from ._sassy_config import CONFIG as PACKAGED_CONFIG
+except ImportError:
+    PACKAGED_CONFIG = None
+
+try:
+    # Generated from messages.yml at build time, see setup.py
+    from ._sassy_messages import MESSAGES as PACKAGED_MESSAGES
+except ImportError:
+    PACKAGED_MESSAGES = None
+
 PATH = Path(__file__).parent
 UPPER_PATH = PATH.parent
 ROOT_PATH = Path('.')
 
 MESSAGES_FILE = PATH / 'messages.yml'
 LOG_CONF_FILE = "logging_default.yml"
+LOG_CONF_PATH = PATH / LOG_CONF_FILE
 CONFIG_FILE = 'sassy.yml'
+CONFIG_PATH = PATH / CONFIG_FILE
 LOGGER = 'root'
+MAX_WORKERS = min(32, (cpu_count() or 1) * 4)
+# Below this many files, a thread pool costs more than it saves.
+PARALLEL_WRITE_MIN_FILES = 500
+# Read once at import: with SASSY_VERBOSE_OFF set to 1, true, yes or on,
+# ``MessageLogger`` leaves the decorated functions unwrapped and logs nothing.
+LOGGING_ENABLED = environ.get('SASSY_VERBOSE_OFF', '').strip().lower() \
+    not in ('1', 'true', 'yes', 'on')
+
+# DTOs are created per file operation, drop their ``__dict__`` when the
+# dataclass ``slots`` option is available (Python 3.10+).
+DATACLASS_OPTIONS = {'slots': True} if version_info >= (3, 10) else {}
 
 
 def get_version() -> str:
@@ -54,7 +96,108 @@ def get_version() -> str:
         return f.read()
 
 
-@dataclass
+@lru_cache(maxsize=None)
+def _keywords_pattern(keywords: FrozenSet[str]) -> Pattern:
+    """
+    Compile a pattern matching any of the keywords.
+
+    Longest keywords are tried first so overlapping keywords resolve to
+    the longest match.
+
+    Args:
+        keywords (frozenset[str]): The keywords to match.
+
+    Returns (Pattern):
+        The compiled pattern.
+    """
+    ordered = sorted(keywords, key=len, reverse=True)
+    return re.compile('|'.join(map(re.escape, ordered)))
+
+
+@lru_cache(maxsize=32)
+def _parse_yaml(path: str, mtime_ns: int, size: int) -> Any:
+    """
+    Parse a YAML file, once per version of the file.
+
+    The modification time and size are only part of the cache key, a
+    modified file is parsed again.
+
+    Args:
+        path (str): The absolute file name.
+        mtime_ns (int): The file modification time, in nanoseconds.
+        size (int): The file size.
+
+    Returns (Any):
+        The dataset.
+    """
+    # Read the whole file at once, LibYAML decodes the raw bytes itself
+    with open(path, 'rb') as file:
+        data = file.read()
+
+    return load(data, Loader=SafeLoader)
+
+
+def _load_yaml(file: Union[Path, str]) -> Any:
+    """
+    Load a YAML file, parsed only when it changed since the last load.
+
+    Args:
+        file (Union[Path, str]): A file name.
+
+    Returns (Any):
+        The dataset, shared with every caller. Do not modify it.
+
+    Raises:
+        FileNotFoundError: The file does not exist.
+        ParserError: The file is not a valid YAML file.
+    """
+    file_stat = stat(file)
+    return _parse_yaml(abspath(file), file_stat.st_mtime_ns, file_stat.st_size)
+
+
+def _replace_keywords(text: str, payload: Dict[str, Any]) -> str:
+    """
+    Replace keywords in a text in a single pass.
+
+    Args:
+        text (str): The text to handle.
+        payload (dict[str, Any]): The keywords and their replacement.
+
+    Returns (str):
+        The text with keywords replaced.
+    """
+    if not payload:
+        return text
+
+    if len(payload) == 1:
+        # str.replace outperforms a regex for a single keyword
+        for k, v in payload.items():
+            return text.replace(k, v)
+
+    pattern = _keywords_pattern(frozenset(payload))
+    return pattern.sub(lambda m: payload[m.group(0)], text)
+
+
+def _write_buffers(fd: int, buffers: Tuple[bytes, ...]):
+    """
+    Write buffers to a file descriptor, in a single call when possible.
+
+    Args:
+        fd (int): An open file descriptor.
+        buffers (tuple[bytes]): The buffers to write, in order.
+    """
+    written = writev(fd, buffers) if writev else 0
+
+    # Resume after a partial write, or write every buffer without writev.
+    for buffer in buffers:
+        view = memoryview(buffer)[written:]
+        written = max(written - len(buffer), 0)
+
+        while view:
+            view = view[write(fd, view):]
+
+
+@dataclass(**DATACLASS_OPTIONS)
 class Result:
     """Result :abbr:`DTO (Data Transfer Object)`."""
 
@@ -128,7 +271,7 @@ class Result:
             self._ok = None
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class Message:
     """``Message`` :abbr:`DTO (Data Transfer Object)`."""
 
@@ -146,6 +289,8 @@ class Message:
         ERROR = 40
         CRITICAL = 50
 
+    _LEVELS = {level.name: level.value for level in SeverityLevel}
+
     def __repr__(self) -> str:
         """
         ``Message`` machine-readable.
@@ -209,10 +354,12 @@ class Message:
         Args:
             text (str): A text.
         """
-        self._text = text.replace("'{}' ", "")
-
         if self.extra:
             self._text = text.format(self.extra)
+        elif "'{}' " in text:
+            self._text = text.replace("'{}' ", "")
+        else:
+            self._text = text
 
     def level(self):
         """
@@ -221,12 +368,10 @@ class Message:
         Returns (str):
             The level name.
         """
-        if self.severity in self.SeverityLevel.__members__:
-            return self.SeverityLevel[self.severity].value
-        return self.SeverityLevel['INFO'].value
+        return self._LEVELS.get(self.severity, self.SeverityLevel.INFO.value)
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class File:
     """``File`` :abbr:`DTO (Data Transfer Object)`."""
 
@@ -247,8 +392,7 @@ class File:
             The content with string replaced.
         """
         if self.content:
-            for k, v in payload.items():
-                self.content = self.content.replace(k, v)
+            return _replace_keywords(self.content, payload)
 
         return self.content
 
@@ -266,13 +410,12 @@ class File:
             The file name.
         """
         if self.name:
-            for k, v in payload.items():
-                self.name = self.name.replace(k, v)
+            return _replace_keywords(self.name, payload)
 
         return self.name
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class Struct:
     """Struct :abbr:`DTO (Data Transfer Object)`."""
 
@@ -321,16 +464,24 @@ class MessageService(MessagesInterface):
     """Message Service class."""
 
     def __init__(self):
-        """Init instance."""
+        """Init instance, messages are loaded on the first ``msg`` call."""
         self.messages: Dict[str, Any] = {}
         self.message_file = MESSAGES_FILE
-        self.load_messages()
+        # code, severity and text of each message name already resolved.
+        self._templates: Dict[str, Tuple[int, str, str]] = {}
 
     def load_messages(self):
-        """Set messages."""
+        """
+        Set messages, parsed again only when the message file changed.
+
+        The packaged ``messages.yml`` is not parsed at all when its
+        pre-parsed module was generated at build time.
+        """
         if not self.messages:
-            with open(self.message_file) as file:
-                self.messages = load(file, Loader=Loader)
+            if PACKAGED_MESSAGES and self.message_file == MESSAGES_FILE:
+                self.messages = PACKAGED_MESSAGES
+            else:
+                self.messages = _load_yaml(self.message_file)
 
     def msg(self, name: str, extra: Optional[str] = None) -> Message:
         """
@@ -343,15 +494,13 @@ class MessageService(MessagesInterface):
         Returns (Message):
             A ``Message`` :abbr:`DTO (Data Transfer Object)`.
         """
+        if not self.messages:
+            self.load_messages()
+
         if name not in self.messages:
-            msg = self.messages['error_msg']
-            extra = name
-        else:
-            msg = self.messages[name]
+            name, extra = 'error_msg', name
 
-        code = msg['code']
-        severity = self.messages['severity'][int(str(msg['code'])[0])]
-        text = msg['text']
+        code, severity, text = self._template(name=name)
 
         message = Message(code=code, severity=severity)
         message.extra = extra
@@ -359,6 +508,37 @@ class MessageService(MessagesInterface):
 
         return message
 
+    def _template(self, name: str) -> Tuple[int, str, str]:
+        """
+        Resolve a message template, once per message name.
+
+        Args:
+            name (str): The message name.
+
+        Returns (tuple):
+            The message code, severity and unformatted text.
+        """
+        template = self._templates.get(name)
+
+        if template is None:
+            msg = self.messages[name]
+            code = msg['code']
+            severity = self.messages['severity'][int(str(code)[0])]
+            template = self._templates[name] = (code, severity, msg['text'])
+
+        return template
+
+
+@lru_cache(maxsize=None)
+def get_message_service() -> MessageService:
+    """
+    Get the message service shared by the whole process.
+
+    Returns (MessageService):
+        A ``MessageService`` instance, the same one on every call.
+    """
+    return MessageService()
+
 
 class RepoProvider(RepoInterface):
     """``RepoProvider`` class."""
@@ -380,11 +560,7 @@ class RepoProvider(RepoInterface):
         Returns (list[tuple]):
             The files and directories added
         """
-        try:
-            return repo.index.add(items)
-
-        except Exception:
-            raise
+        return repo.index.add(items)
 
     def _git_commit(self, repo: Repo) -> str:
         """
@@ -396,12 +572,8 @@ class RepoProvider(RepoInterface):
         Returns:
             The commit number.
         """
-        try:
-            commit = repo.index.commit(self._INIT_COMMIT)
-            return str(commit)
-
-        except Exception:
-            raise
+        commit = repo.index.commit(self._INIT_COMMIT)
+        return str(commit)
 
     @staticmethod
     def _git_init(repo_dir: str) -> Repo:
@@ -414,11 +586,7 @@ class RepoProvider(RepoInterface):
         Returns (git.repo.base.Repo):
             The ``Repo``.
         """
-        try:
-            return Repo.init(repo_dir)
-
-        except Exception:
-            raise
+        return Repo.init(repo_dir)
 
     def init(self, repo_name: str, items: List[str]) -> str:
         """
@@ -431,36 +599,51 @@ class RepoProvider(RepoInterface):
         Returns:
             The commit number.
         """
-        try:
-            repo: Repo = self._git_init(repo_dir=repo_name)
-            self._git_add(repo=repo, items=items)
-            commit = self._git_commit(repo=repo)
+        repo: Repo = self._git_init(repo_dir=repo_name)
+        self._git_add(repo=repo, items=items)
 
-            return str(commit)
-
-        except Exception:
-            raise
+        return self._git_commit(repo=repo)
 
 
 class MessageLogger:
     """Logger as decorator."""
 
+    _LOG_METHODS = {
+        'DEBUG': 'debug',
+        'INFO': 'info',
+        'WARNING': 'warning',
+        'ERROR': 'error',
+        'CRITICAL': 'critical',
+    }
+    _LOGGING_CONFIGURED = False
+    _LOGGER_CACHE: Optional[logging.Logger] = None
+
     def __init__(self, show: str = 'all'):
         """
         Init Logger.
 
+        The logging configuration is loaded once per process and shared by
+        every ``MessageLogger`` instance. It is not loaded at all when the
+        logger already has handlers.
+
         Args:
             show (str): Choose what to log.
                 Choices are: [ok, err, all] default: all
         """
         self.show = show
-        self.logging_conf = PATH / LOG_CONF_FILE
+        self.logging_conf = LOG_CONF_PATH
+
+        if not MessageLogger._LOGGING_CONFIGURED:
+            # Keep the logging set up by an application embedding sassy.
+            if not logging.getLogger(LOGGER).handlers:
+                with open(self.logging_conf, 'rb') as f:
+                    logging_config = load(f, Loader=SafeLoader)
+                    logging.config.dictConfig(logging_config)
 
-        with open(self.logging_conf, 'r') as f:
-            logging_config = load(f, Loader=Loader)
-            logging.config.dictConfig(logging_config)
+            MessageLogger._LOGGING_CONFIGURED = True
 
-        self.logger = logging.getLogger(LOGGER)
+        self.logger = MessageLogger._LOGGER_CACHE or logging.getLogger(LOGGER)
+        MessageLogger._LOGGER_CACHE = self.logger
 
     def __call__(self, func):
         """
@@ -470,8 +653,12 @@ class MessageLogger:
             func: The function decorated.
 
         Returns (func):
-            the function decorated.
+            the function decorated, or ``func`` itself when logging is
+            disabled.
         """
+        if not LOGGING_ENABLED:
+            return func
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             result: Result = func(*args, **kwargs)
@@ -481,22 +668,30 @@ class MessageLogger:
                 m.text = f"{func.__name__}:{result}"
                 self.log(message=m)
 
-            if not isinstance(result, Result):
-                return result
+            return self.emit(result)
+
+        return wrapper
 
-            if isinstance(result.ok, Message) \
-                    and self.show in ['ok', 'all']:
-                result.ok.text = result.ok.text
-                self.log(message=result.ok)
+    def emit(self, result: Any) -> Any:
+        """
+        Log the message held by a result.
 
-            elif isinstance(result.err, Message) \
-                    and self.show in ['err', 'all']:
-                result.err.text = result.err.text
-                self.log(message=result.err)
+        Args:
+            result (Any): A ``Result``, anything else is not logged.
 
+        Returns (Any):
+            The result, unchanged.
+        """
+        if not LOGGING_ENABLED or type(result) is not Result:
             return result
 
-        return wrapper
+        if type(result.ok) is Message and self.show in ('ok', 'all'):
+            self.log(message=result.ok)
+
+        elif type(result.err) is Message and self.show in ('err', 'all'):
+            self.log(message=result.err)
+
+        return result
 
     def log(self, message: Message):
         """
@@ -508,16 +703,8 @@ class MessageLogger:
         Returns:
             None
         """
-        if message.level() == 10:
-            self.logger.debug(message.text)
-        elif message.level() == 20:
-            self.logger.info(message.text)
-        elif message.level() == 30:
-            self.logger.warning(message.text)
-        elif message.level() == 40:
-            self.logger.error(message.text)
-        elif message.level() == 50:
-            self.logger.critical(message.text)
+        log_method = self._LOG_METHODS.get(message.severity, 'info')
+        getattr(self.logger, log_method)(message.text)
 
 
 class Config:
@@ -527,12 +714,23 @@ class Config:
         """Init ``Config`` instance."""
         self.message = message
         self.cfg: Dict[str, Any] = {}
+        # Datasets derived from cfg, reset whenever cfg is loaded.
+        self.cfg_cache: Dict[Any, Any] = {}
+
+    @classmethod
+    def clear_cache(cls):
+        """Forget every configuration dataset already loaded."""
+        _parse_yaml.cache_clear()
 
     @MessageLogger(show='err')
     def load_config(self, config_file) -> Result:
         """
         Load the configuration dataset.
 
+        A configuration file is parsed once and reused until it is
+        modified. The packaged ``sassy.yml`` is not parsed at all when
+        its pre-parsed module was generated at build time.
+
         Returns (Result):
             Result :abbr:`DTO (Data Transfer Object)`.
               - ok, (dict) A dataset.
@@ -541,10 +739,16 @@ class Config:
         """
         result = Result()
 
+        if PACKAGED_CONFIG and Path(config_file) == CONFIG_PATH:
+            result.ok = PACKAGED_CONFIG
+            self.cfg = result.ok
+            self.cfg_cache.clear()
+            return result
+
         try:
-            with open(config_file) as file:
-                result.ok = load(file, Loader=Loader)
-                self.cfg = result.ok
+            result.ok = _load_yaml(config_file)
+            self.cfg = result.ok
+            self.cfg_cache.clear()
 
         except FileNotFoundError as exc:
             result.err = self.message.msg(
@@ -562,13 +766,18 @@ class Sassy(Config):
 
     STRUCTURE = 'structure'
     FEATURE = 'features'
-    ROOT_DIRS = ['root', 'tests', 'docs']
+    ROOT_DIRS = frozenset(('root', 'tests', 'docs'))
     TEST = 'test'
     DIRS = 'dirs'
     FILES = 'files'
     APPS = 'apps'
     FEAT = 'feature'
     ARGS = 'args'
+    SRC = 'src'
+    # File and directory operations are called per item, they log their
+    # result directly rather than through the decorator. One logger is
+    # shared by every instance.
+    _emit = MessageLogger(show='all').emit
 
     def __init__(
             self,
@@ -586,12 +795,13 @@ class Sassy(Config):
         """
         self.apps = apps
         self.apps_path: Path = ROOT_PATH / self.apps
-        self.config_file: Path = PATH / CONFIG_FILE
+        self._src_path: Path = self.apps_path / self.SRC
+        self._build_path_cached = lru_cache(maxsize=None)(self._build_path)
+        self.config_file: Path = CONFIG_PATH
         self.update: bool = False
-        self.message = message
         self.repo = repo
         super().__init__(message=message)
-        super().load_config(config_file=self.config_file)
+        self.load_config(config_file=self.config_file)
 
     def build_path(self, struct_name: str, dir_name: str) -> Path:
         """
@@ -604,13 +814,23 @@ class Sassy(Config):
         Returns (Path):
             A path.
         """
-        sub_dir = 'src'
-        path = self.apps_path / sub_dir / dir_name
+        return self._build_path_cached(struct_name, dir_name)
 
+    def _build_path(self, struct_name: str, dir_name: str) -> Path:
+        """
+        Build a path, see ``build_path``.
+
+        Args:
+            struct_name (str): A structure name e.i: `clean_arch`.
+            dir_name (str): A directory name e.i: `applications`.
+
+        Returns (Path):
+            A path.
+        """
         if struct_name in self.ROOT_DIRS:
-            path = self.apps_path / dir_name
+            return self.apps_path / dir_name
 
-        return path
+        return self._src_path / dir_name
 
     @staticmethod
     def _get_file_dto(files: Union[Dict[str, Any], str]) -> File:
@@ -623,14 +843,16 @@ class Sassy(Config):
         Returns (File):
             A ``File`` :abbr:`DTO (Data Transfer Object)`.
         """
+        files_type = type(files)
+
         # Only a file name
-        if isinstance(files, str):
+        if files_type is str:
             return File(name=files)
 
         # A file name and his content
-        if isinstance(files, dict):
-            for f, c in files.items():
-                return File(name=f, content=c)
+        if files_type is dict and files:
+            f, c = next(iter(files.items()))
+            return File(name=f, content=c)
 
     def _get_args(self) -> Dict[str, str]:
         """
@@ -641,47 +863,77 @@ class Sassy(Config):
         """
         return self.cfg.get(self.ARGS, {})
 
-    def _get_struct_dto(self, field: str = STRUCTURE) -> List[Struct]:
+    def _iter_struct_dto(self, field: str = STRUCTURE) -> Iterator[Struct]:
         """
-        Get a structure dataset.
+        Iterate over a structure dataset.
+
+        ``Struct`` DTOs are built lazily, one at a time.
 
         Args:
             field: The field to extract the structure
 
-        Returns (list[Struct]):
-            A list of ``Struct`` :abbr:`DTO (Data Transfer Object)`.
+        Yields (Struct):
+            A ``Struct`` :abbr:`DTO (Data Transfer Object)`.
         """
         structures: Dict[str, Any] = self.cfg.get(field, {})
-        dto = []
 
         for k, v in structures.items():
             dirs: List[str] = v.get(self.DIRS, [])
             files: List[str] = v.get(self.FILES, [])
             files_dto: List[File] = [self._get_file_dto(f) for f in files]
-            dto.append(Struct(name=k, dirs=dirs, files=files_dto))
+            yield Struct(name=k, dirs=dirs, files=files_dto)
 
-        return dto
+    def _get_struct_dto(self, field: str = STRUCTURE) -> List[Struct]:
+        """
+        Get a structure dataset.
+
+        Args:
+            field: The field to extract the structure
+
+        Returns (list[Struct]):
+            A list of ``Struct`` :abbr:`DTO (Data Transfer Object)`,
+            built once per loaded configuration.
+        """
+        key = (self.STRUCTURE, field)
+
+        if key not in self.cfg_cache:
+            self.cfg_cache[key] = list(self._iter_struct_dto(field=field))
+
+        return self.cfg_cache[key]
 
     def _get_feature_structure_dto(self) -> List[Struct]:
         """
         Get the feature structure dataset.
 
+        Returns (list[Struct]):
+            A list of `Struct` :abbr:`DTO (Data Transfer Object)`,
+            built once per loaded configuration.
+        """
+        key = (self.FEATURE, self.STRUCTURE)
+
+        if key not in self.cfg_cache:
+            self.cfg_cache[key] = self._build_feature_structure_dto()
+
+        return self.cfg_cache[key]
+
+    def _build_feature_structure_dto(self) -> List[Struct]:
+        """
+        Build the feature structure dataset.
+
         Returns (list[Struct]):
             A list of `Struct` :abbr:`DTO (Data Transfer Object)`.
         """
         feature_structures = []
-        structs: List[Struct] = self._get_struct_dto()
-        features: List[Struct] = self._get_struct_dto(field=self.FEATURE)
+        # Only the directories of the structure are needed, skip its DTOs.
+        structures: Dict[str, Any] = self.cfg.get(self.STRUCTURE, {})
+        struct_dirs = {k: v.get(self.DIRS, []) for k, v in structures.items()}
 
-        for feat_struct in features:
+        for feat_struct in self._iter_struct_dto(field=self.FEATURE):
             feat_directories: List[str] = feat_struct.dirs
             feat_files: List[File] = feat_struct.files
-
-            dirs = []
-            for struct in structs:
-                if struct.name in feat_directories:
-                    dirs = struct.dirs
-                    break
+            dirs = next(
+                (struct_dirs[name] for name in feat_directories
+                 if name in struct_dirs), [])
 
             feature_structures.append(
                 Struct(name=feat_struct.name, dirs=dirs, files=feat_files))
@@ -697,39 +949,54 @@ class Sassy(Config):
               - err, `Message` :abbr:`DTO (Data Transfer Object)`.
         """
         apps_keyword = {self.cfg[self.APPS]: self.apps}
-        repo_path_name: Optional[Path] = None
-        dirs_and_files = []
-
-        for struct in self._get_struct_dto():
-            # create dir
-            dirs = struct.dirs if struct.dirs else ['']
-
-            for dir_name in dirs:
-                path: Path = self.build_path(
-                    struct_name=struct.name, dir_name=dir_name)
-
-                result: Result = self.create_dir(name=path)
-                if result.err:
-                    return result
-
-                if not repo_path_name:
-                    repo_path_name = path
-                else:
-                    dirs_and_files.append(path)
+        struct_paths = [
+            (struct, [
+                self.build_path(struct_name=struct.name, dir_name=dir_name)
+                for dir_name in (struct.dirs if struct.dirs else [''])])
+            for struct in self._get_struct_dto()
+        ]
+
+        # create dir, each one once and parents before their children
+        dirs: List[Path] = sorted(
+            dict.fromkeys(
+                path for _, paths in struct_paths for path in paths),
+            key=lambda path: len(path.parts))
+
+        for path in dirs:
+            result: Result = self.create_dir(name=path)
+            if result.err:
+                return result
 
+        # The repository goes in the first directory in config order, not
+        # the first one created.
+        repo_path_name: Optional[Path] = \
+            struct_paths[0][1][0] if struct_paths else None
+        dirs_and_files = [path for path in dirs if path != repo_path_name]
+
+        for struct, paths in struct_paths:
+            pending: Dict[Path, Any] = {}
+            # Same names and contents for every directory of the struct
+            files = [
+                (file.replace_file_name(apps_keyword),
+                 file.replace_content(apps_keyword))
+                for file in struct.files
+            ]
+
+            for path in paths:
                 # create file
-                for file in struct.files:
-                    file_name: str = file.replace_file_name(apps_keyword)
-                    content: str = file.replace_content(apps_keyword)
+                for file_name, content in files:
                     file_path: Path = path / file_name
-                    files = {file_path: content}
+                    pending[file_path] = content
                     dirs_and_files.append(file_path)
 
-                    self.create_file(files=files)
+            if pending:
+                self.create_files(files=pending)
 
         if repo_path_name:
-            repo_name: str = abspath(repo_path_name)
-            items: List[str] = [abspath(d) for d in dirs_and_files]
+            # Same as abspath() without a getcwd() syscall per item.
+            cwd = getcwd()
+            repo_name: str = normpath(join(cwd, repo_path_name))
+            items: List[str] = [normpath(join(cwd, d)) for d in dirs_and_files]
             repo_apps = InitRepo(repo=self.repo, message=self.message)
             repo_apps(repo_name=repo_name, items=items)
 
@@ -779,6 +1046,13 @@ class Sassy(Config):
         feat_keyword = {self.cfg[self.FEAT]: feature}
 
         for struct in self._get_feature_structure_dto():
+            # Same names and contents for every directory of the struct
+            files = [
+                (file.replace_file_name(feat_keyword),
+                 file.replace_content(feat_keyword))
+                for file in struct.files
+            ]
+
             for dir_name in struct.dirs:
                 if not self.is_valid_directory(directory=dir_name, **kwargs):
                     continue
@@ -786,13 +1060,10 @@ class Sassy(Config):
                 path: Path = self.build_path(
                     struct_name=struct.name, dir_name=dir_name)
                 # create file
-                for file in struct.files:
-                    file_name: str = file.replace_file_name(feat_keyword)
-                    content: str = file.replace_content(feat_keyword)
+                for file_name, content in files:
                     file_path: Path = path / file_name
-                    files = {file_path: content}
 
-                    self.create_file(files=files)
+                    self.create_file(file=file_path, content=content)
 
     def delete_feature(self, feature: str, **kwargs) -> None:
         """
@@ -812,6 +1083,9 @@ class Sassy(Config):
         payload = {self.cfg[self.FEAT]: feature}
 
         for struct in self._get_feature_structure_dto():
+            file_names = [
+                file.replace_file_name(payload) for file in struct.files]
+
             for dir_name in struct.dirs:
                 if not self.is_valid_directory(directory=dir_name, **kwargs):
                     continue
@@ -820,18 +1094,43 @@ class Sassy(Config):
                     struct_name=struct.name, dir_name=dir_name)
 
                 # create file
-                for file in struct.files:
-                    file_name: str = file.replace_file_name(payload)
+                for file_name in file_names:
                     file_path: Path = path / file_name
                     self.delete_file(file=file_path)
 
-    @MessageLogger(show='all')
-    def create_file(self, files: Dict[Path, Any]) -> Result:
+    def _write_file(self, file: Path, content: str):
+        """
+        Write a file and its content.
+
+        Unless updating, the file is opened in exclusive creation mode so
+        the existence check and the creation are a single system call. The
+        content is encoded once and written straight to the descriptor,
+        without the buffered text I/O layer, along with the trailing newline.
+
+        Args:
+            file (Path): The file name.
+            content (str): The file content.
+
+        Raises:
+            FileExistsError: The file exists and ``update`` is not set.
+        """
+        flags = O_WRONLY | O_CREAT | (O_TRUNC if self.update else O_EXCL)
+        buffers = (content.encode('utf-8'), b"\n")
+        # Same default as ``Path.touch``, the umask decides the permissions
+        fd = os_open(file, flags, 0o666)
+
+        try:
+            _write_buffers(fd=fd, buffers=buffers)
+        finally:
+            close(fd)
+
+    def create_file(self, file: Path, content: str = '') -> Result:
         """
         Create a file and add content.
 
         Args:
-            files (dict[Path, Any]): A file name
+            file (Path): A file name.
+            content (str): The file content.
 
         Returns:
             Result :abbr:`DTO (Data Transfer Object)`.
@@ -840,26 +1139,160 @@ class Sassy(Config):
         """
         result = Result()
 
-        for file, content in files.items():
-            if file.is_file() and not self.update:
-                result.err = self.message.msg(
-                    name='file_exists', extra=str(file))
-                return result
+        try:
+            self._write_file(file=file, content=content)
+            result.ok = self.message.msg(
+                name='file_create_ok', extra=str(file))
 
-            try:
-                file.touch()
-                file.write_text(content + "\n")
-                result.ok = self.message.msg(
-                    name='file_create_ok', extra=str(file))
+        except FileExistsError:
+            result.err = self.message.msg(name='file_exists', extra=str(file))
+
+        except Exception as exc:
+            result.err = self.message.msg(
+                name='file_create_failed', extra=str(file))
+            result.err.text += f" {exc}"
+
+        return self._emit(result)
+
+    def _write_batch(
+            self,
+            files: List[Tuple[Path, Any]]
+    ) -> Optional[Tuple[Path, Exception]]:
+        """
+        Write files until one of them fails.
+
+        Args:
+            files (list[tuple[Path, Any]]): File names and their content.
 
+        Returns (Optional[tuple[Path, Exception]]):
+            The file that failed and its exception, None if all are written.
+        """
+        for file, content in files:
+            try:
+                self._write_file(file=file, content=content)
             except Exception as exc:
-                result.err = self.message.msg(
-                    name='file_create_failed', extra=str(file))
-                result.err.text += f" {exc}"
+                return file, exc
 
-            return result
+        return None
+
+    def _write_parallel(
+            self,
+            files: Dict[Path, Any]
+    ) -> Optional[Tuple[Path, Exception]]:
+        """
+        Write files from a thread pool, one task per parent directory.
+
+        Files sharing a single directory are written inline, one task
+        would not spread the pool's cost.
+
+        Args:
+            files (dict[Path, Any]): File names and their content.
+
+        Returns (Optional[tuple[Path, Exception]]):
+            The first file that failed and its exception, None if all are
+            written.
+        """
+        # Directories are independent, overlap their I/O.
+        batches: Dict[Path, List[Tuple[Path, Any]]] = {}
+
+        for file, content in files.items():
+            batches.setdefault(file.parent, []).append((file, content))
+
+        if len(batches) == 1:
+            return self._write_batch(files=next(iter(batches.values())))
+
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            futures = [
+                executor.submit(self._write_batch, files=batch)
+                for batch in batches.values()
+            ]
+
+            for future in as_completed(futures):
+                failed = future.result()
+
+                if failed:
+                    # Stop at the first failure, drop the writes not started.
+                    for pending in futures:
+                        pending.cancel()
+
+                    return failed
+
+        return None
+
+    def create_files(self, files: Dict[Path, Any]) -> Result:
+        """
+        Create files and add their content.
+
+        Nothing is written if one of the files already exists. Files are
+        written inline unless there are enough of them to pay for a thread
+        pool.
+
+        Args:
+            files (dict[Path, Any]): File names and their content.
+
+        Returns:
+            Result :abbr:`DTO (Data Transfer Object)`.
+              - ok, `Message` :abbr:`DTO (Data Transfer Object)`.
+              - err, `Message` :abbr:`DTO (Data Transfer Object)`.
+        """
+        result = Result()
+
+        existing: Optional[Path] = \
+            None if self.update else self._find_existing_file(files)
+
+        if existing:
+            result.err = self.message.msg(
+                name='file_exists', extra=str(existing))
+            return self._emit(result)
+
+        if len(files) < PARALLEL_WRITE_MIN_FILES:
+            failed = self._write_batch(files=list(files.items()))
+        else:
+            failed = self._write_parallel(files=files)
+
+        if failed:
+            file, exc = failed
+            result.err = self.message.msg(
+                name='file_create_failed', extra=str(file))
+            result.err.text += f" {exc}"
+            return self._emit(result)
+
+        result.ok = self.message.msg(name='create_files_ok')
+        return self._emit(result)
+
+    @staticmethod
+    def _find_existing_file(files: Iterable[Path]) -> Optional[Path]:
+        """
+        Find the first file that already exists.
+
+        Each parent directory is listed once instead of checking every
+        file with a ``stat`` call.
+
+        Args:
+            files (Iterable[Path]): File names.
+
+        Returns (Optional[Path]):
+            The first existing file, ``None`` otherwise.
+        """
+        listings: Dict[Path, Set[str]] = {}
+
+        for file in files:
+            parent = file.parent
+
+            if parent not in listings:
+                try:
+                    with scandir(parent) as entries:
+                        listings[parent] = {
+                            e.name for e in entries if e.is_file()}
+
+                except OSError:
+                    listings[parent] = set()
+
+            if file.name in listings[parent]:
+                return file
+
+        return None
 
-    @MessageLogger(show='all')
     def delete_file(self, file: Path) -> Result:
         """
         Delete a file.
@@ -877,7 +1310,7 @@ class Sassy(Config):
         if not file.is_file():
             result.err = self.message.msg(
                 name='file_not_exist', extra=str(file))
-            return result
+            return self._emit(result)
 
         try:
             file.unlink()
@@ -889,9 +1322,8 @@ class Sassy(Config):
                 name='file_delete_failed', extra=str(file))
             result.err.text += f" {exc}"
 
-        return result
+        return self._emit(result)
 
-    @MessageLogger(show='all')
     def create_dir(self, name: Optional[Path] = None) -> Result:
         """
         Create a directory.
@@ -909,19 +1341,25 @@ class Sassy(Config):
         if not name:
             name = self.apps_path
 
-        if name.is_dir() and not self.update:
-            result.err = self.message.msg(name='dir_exists', extra=str(name))
-            return result
-
         try:
-            name.mkdir(parents=True)
-        except (FileExistsError, FileNotFoundError):
+            name.mkdir(parents=True, exist_ok=self.update)
+        except FileExistsError as exc:
+            if name.is_dir():
+                result.err = self.message.msg(
+                    name='dir_exists', extra=str(name))
+            else:
+                # Something else than a directory is in the way
+                result.err = self.message.msg(
+                    name='dir_create_failed', extra=str(name))
+                result.err.text += f" {exc}"
+        except OSError as exc:
             result.err = self.message.msg(
                 name='dir_create_failed', extra=str(name))
+            result.err.text += f" {exc}"
         else:
             result.ok = self.message.msg(name='dir_create_ok', extra=str(name))
 
-        return result
+        return self._emit(result)
 
 
 class InitRepo:
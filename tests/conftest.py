@@ -1,6 +1,11 @@
 """Config file conftest for pytests."""
 import os
+from pathlib import Path
+
 import pytest
+from yaml import safe_load
+
+from src import Config, get_message_service
 
 try:
     from.temp_env_var import TEMP_ENV_VARS
@@ -18,3 +23,36 @@ def tests_setup_and_teardown():
     # Will be executed after the last test
     os.environ.clear()
     os.environ.update(old_environ)
+
+
+@pytest.fixture(autouse=True)
+def clear_config_cache():
+    # Tests patch the YAML loader, never reuse a previous test's dataset
+    Config.clear_cache()
+
+
+@pytest.fixture(autouse=True)
+def logging_enabled(monkeypatch):
+    # The toggle is read from SASSY_VERBOSE_OFF at import, pin it per test
+    monkeypatch.setattr('src.LOGGING_ENABLED', True)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def message_service():
+    # Parse the messages once for the whole session
+    service = get_message_service()
+    service.load_messages()
+    return service
+
+
+@pytest.fixture(scope="session")
+def yaml_file():
+    # The sassy.yml shipped with the package
+    return Path(__file__).parents[1] / 'src' / 'sassy.yml'
+
+
+@pytest.fixture(scope="session")
+def parsed_yaml(yaml_file):
+    # Parse the packaged sassy.yml once for the whole session
+    with open(yaml_file, encoding='utf-8') as file:
+        return safe_load(file)
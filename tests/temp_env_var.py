@@ -1,3 +1 @@
-TEMP_ENV_VARS = {
-    'SASSY_VERBOSE_OFF': 'off'
-}
+TEMP_ENV_VARS = {}
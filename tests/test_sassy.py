@@ -5,16 +5,27 @@ Contact:
   Arnaud SENE, arnaud.sene@halia.ca
   Karol KOZUBAL, karol.lozubal@halia.ca
 """
+import importlib
+import logging
+import os
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List
 from unittest.mock import patch, call
+from zipfile import ZipFile
 
 import pytest
 from git import Repo
 from pytest import mark
+from yaml import safe_load
 
+import src
 from src import RepoInterface, MessageService, Result, Message, \
-    MessageLogger, Config, Sassy, File, InitRepo, RepoProvider, Struct
+    MessageLogger, Config, Sassy, File, InitRepo, RepoProvider, Struct, \
+    get_message_service
 
 APPS_PATH = 'src'
 
@@ -48,24 +59,34 @@ class FakeRepoProvider(RepoInterface):
             raise
 
 
-class TestSassy:
-    """Main test for Sassy."""
-
-    repo = FakeRepoProvider()
-
-    _VERBOSE = False
-
-    TESTS_DIR = Path(__file__).parents[0]
-    # CWD = Path(__file__).parents[1]
-    CWD = Path('.')
-    SASSY_DIR = CWD / APPS_PATH
-    YAML_FILE = SASSY_DIR / 'sassy.yml'
-    FAKE_APPS = 'src'
-    sassy_dir = SASSY_DIR.resolve().as_posix()
-    yaml_file = YAML_FILE.resolve().as_posix()
-
-    message = MessageService()
-    yaml_load = {
+@pytest.fixture
+def repo():
+    """A fake repository provider."""
+    return FakeRepoProvider()
+
+
+@pytest.fixture(scope='module')
+def wheel(tmp_path_factory):
+    """The wheel pip builds, through the PEP 517 isolated build."""
+    # Build from a copy, the build leaves its artifacts next to setup.py
+    source = tmp_path_factory.mktemp('source') / 'sassy'
+    shutil.copytree(
+        Path(__file__).parents[1], source,
+        ignore=shutil.ignore_patterns(
+            '.git', 'build', '*.egg-info', '__pycache__', '.pytest_cache'))
+    wheel_dir = tmp_path_factory.mktemp('wheel')
+    build = subprocess.run(
+        [sys.executable, '-m', 'pip', 'wheel', str(source), '--no-deps',
+         '-q', '-w', str(wheel_dir)],
+        capture_output=True, text=True)
+    assert build.returncode == 0, build.stderr
+    return ZipFile(next(wheel_dir.glob('*.whl')))
+
+
+@pytest.fixture(scope='module')
+def yaml_load():
+    """The mocked configuration dataset shared by the tests."""
+    return {
         'apps': '__ABC__',
         'feature': '__123__',
         'structure': {
@@ -97,6 +118,37 @@ class TestSassy:
         }
     }
 
+
+class TestSassy:
+    """Main test for Sassy."""
+
+    CWD = Path('.')
+    FAKE_APPS = 'src'
+
+    @pytest.fixture
+    def sassy(self, message_service, repo, parsed_yaml):
+        """A Sassy instance, not in update mode."""
+        with patch(f'{APPS_PATH}._load_yaml', return_value=parsed_yaml):
+            return Sassy(
+                apps='fakesassy', message=message_service, repo=repo)
+
+    @pytest.fixture
+    def patched_config(self, message_service, repo, monkeypatch):
+        """Build a Sassy instance on a mocked configuration dataset."""
+        def _apply(dataset):
+            monkeypatch.setattr(
+                f'{APPS_PATH}._load_yaml', lambda file: dataset)
+            return Sassy(
+                apps='fakesassy', message=message_service, repo=repo)
+        return _apply
+
+    @pytest.fixture
+    def fake_message(self):
+        """A Message with its text set."""
+        m = Message(999, 'TEST', 'extra')
+        m.text = 'a fake text'
+        return m
+
     # Domains
 
     def test_result_dto_ok_or_err(self):
@@ -107,6 +159,17 @@ class TestSassy:
         assert r.ok
         assert not r.err
 
+    @mark.skipif(sys.version_info < (3, 10), reason='dataclass slots')
+    @mark.parametrize('dto', [
+        Result(),
+        Message(code=999, severity='INFO'),
+        File(name='fake'),
+        Struct(name='fake', dirs=[], files=[]),
+    ])
+    def test_dto_slots(self, dto):
+        """DTOs have no instance dict."""
+        assert not hasattr(dto, '__dict__')
+
     def test_result_dto_as_str_ok(self):
         """rewrite __str__."""
         r = Result()
@@ -136,48 +199,41 @@ class TestSassy:
         m = Message(code, severity, extra)
         assert m.level() == lvl
 
-    def test_message_dto_reps(self):
-        """rewrite __repr__."""
-        code = 999
-        severity = 'TEST'
-        extra = 'extra'
-        text = 'a fake text'
-        expected = f"Message(code: {code}, severity: {severity}, text: {text})"
-
-        m = Message(code, severity, extra)
+    @mark.parametrize('extra, text, expected', [
+        (None, "File '{}' already exist!", 'File already exist!'),
+        ('abc', "File '{}' already exist!", "File 'abc' already exist!"),
+        (None, 'Files creation done!', 'Files creation done!'),
+    ])
+    def test_message_dto_text(self, extra, text, expected):
+        m = Message(code=999, severity='INFO', extra=extra)
         m.text = text
+        assert m.text == expected
 
-        assert repr(m) == expected
+    def test_message_dto_text_not_shared(self):
+        """text is an instance field, not a class attribute."""
+        first = Message(code=999, severity='INFO')
+        second = Message(code=999, severity='INFO')
+        first.text = 'a fake text'
+        assert first.text == 'a fake text'
+        assert second.text == ''
 
-    def test_message_dto_as_str(self):
-        """rewrite __str__."""
-        code = 999
-        severity = 'TEST'
-        extra = 'extra'
-        text = 'a fake text'
-        expected = f"({code},{severity},{text})"
-
-        m = Message(code, severity, extra)
-        m.text = text
+    def test_message_dto_reps(self, fake_message):
+        """rewrite __repr__."""
+        expected = "Message(code: 999, severity: TEST, text: a fake text)"
+        assert repr(fake_message) == expected
 
-        assert str(m) == expected
+    def test_message_dto_as_str(self, fake_message):
+        """rewrite __str__."""
+        assert str(fake_message) == "(999,TEST,a fake text)"
 
-    def test_message_dto_as_dict(self):
+    def test_message_dto_as_dict(self, fake_message):
         """as_dict() method"""
-        code = 999
-        severity = 'TEST'
-        extra = 'extra'
-        text = 'a fake text'
         expected = {
-            "code": code,
-            "severity": severity,
-            "text": text
+            "code": 999,
+            "severity": 'TEST',
+            "text": 'a fake text'
         }
-
-        m = Message(code, severity, extra)
-        m.text = text
-
-        assert m.as_dict() == expected
+        assert fake_message.as_dict() == expected
 
     # Applications
 
@@ -229,6 +285,50 @@ class TestSassy:
             mock.assert_not_called()
             assert rr == result
 
+    def test_message_logger_disabled(self):
+        """logging disabled, the function is not wrapped"""
+        result = Result()
+        result.ok = Message(code=999, severity='INFO')
+
+        def foo(r):
+            return r
+
+        with patch(f'{APPS_PATH}.LOGGING_ENABLED', False), \
+                patch(f'{APPS_PATH}.MessageLogger.log') as mock:
+            logger = MessageLogger(show='all')
+            assert logger(foo) is foo
+            assert logger.emit(result) is result
+            mock.assert_not_called()
+
+    def test_message_logger_verbose_off(self, monkeypatch):
+        """Only an explicit value turns logging off"""
+        saved = dict(src.__dict__)
+
+        try:
+            for value, expected in [('1', False), ('TRUE', False),
+                                    ('0', True), ('false', True),
+                                    ('', True)]:
+                monkeypatch.setenv('SASSY_VERBOSE_OFF', value)
+                assert importlib.reload(src).LOGGING_ENABLED is expected
+        finally:
+            # The other tests hold the objects of the first import
+            src.__dict__.clear()
+            src.__dict__.update(saved)
+
+    def test_message_logger_emit_ok(self, sassy, tmp_path):
+        """file and directory operations log their result"""
+
+        with patch(f'{APPS_PATH}.MessageLogger.log') as mock:
+            r = sassy.create_dir(name=tmp_path / 'new_dir')
+            mock.assert_called_once_with(message=r.ok)
+            assert r.ok.code == 102
+
+    def test_message_logger_emit_shared(self, message_service, repo):
+        """Sassy instances share one logger"""
+        first = Sassy(apps='fakesassy', message=message_service, repo=repo)
+        second = Sassy(apps='other', message=message_service, repo=repo)
+        assert first._emit.__self__ is second._emit.__self__
+
     def test_message_logger_no_result(self):
         """return func, not a Result instance"""
         result = 'abc'
@@ -242,26 +342,87 @@ class TestSassy:
             mock.assert_not_called()
             assert rr == result
 
-    def test_sassy_load_config_ok(self):
+    def test_sassy_load_config_ok(
+            self, message_service, yaml_file, parsed_yaml):
         """load_config return a dict."""
-        config = Config(message=self.message)
-        result_cfg = config.load_config(config_file=self.yaml_file)
-        sassy = Sassy(
-            apps='fakesassy', message=self.message, repo=self.repo)
-        assert result_cfg.ok == sassy.cfg
+        config = Config(message=message_service)
+        result_cfg = config.load_config(config_file=yaml_file)
+        assert result_cfg.ok == parsed_yaml
+
+    def test_sassy_load_config_cached(self, message_service, tmp_path):
+        """load_config parses a file once until it is modified."""
+        config_file = tmp_path / 'sassy.yml'
+        config_file.write_text('apps: __APPS__')
+        config = Config(message=message_service)
+        first = config.load_config(config_file=config_file)
+
+        with patch(f'{APPS_PATH}.load') as mock:
+            second = Config(message=message_service).load_config(
+                config_file=config_file)
+            mock.assert_not_called()
+            assert second.ok is first.ok
+
+        config_file.write_text('apps: __NEW__')
+        stat = config_file.stat()
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        third = config.load_config(config_file=config_file)
+        assert third.ok == {'apps': '__NEW__'}
+
+        # Same modification time, different size
+        stat = config_file.stat()
+        config_file.write_text('apps: __NEWER__')
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        fourth = config.load_config(config_file=config_file)
+        assert fourth.ok == {'apps': '__NEWER__'}
+
+    def test_sassy_load_config_packaged(self, message_service, yaml_file):
+        """The packaged config pre-parsed at build time is not parsed."""
+        packaged = {'apps': '__PACKAGED__'}
+        config = Config(message=message_service)
+
+        with patch(f'{APPS_PATH}.PACKAGED_CONFIG', packaged), \
+                patch(f'{APPS_PATH}.load') as mock:
+            result = config.load_config(config_file=yaml_file)
+            mock.assert_not_called()
+
+        assert result.ok is packaged
+        assert config.cfg is packaged
+
+    def test_sassy_wheel_contents(self, wheel):
+        """The wheel ships both pre-parsed modules next to their YAML."""
+        names = set(wheel.namelist())
+        for module in ('sassy.yml', '_sassy_config.py',
+                       'messages.yml', '_sassy_messages.py'):
+            assert f'{APPS_PATH}/{module}' in names
+
+    @mark.parametrize('yaml_file, module, constant', [
+        ('sassy.yml', '_sassy_config.py', 'CONFIG'),
+        ('messages.yml', '_sassy_messages.py', 'MESSAGES'),
+    ])
+    def test_sassy_generated_dataset(
+            self, wheel, yaml_file, module, constant):
+        """The wheel ships the YAML pre-parsed, key order included."""
+        generated = wheel.read(f'{APPS_PATH}/{module}')
+        namespace = {}
+        exec(generated.decode('utf-8'), namespace)
 
-    def test_sassy_load_config_bad_format(self):
+        source = Path(__file__).parents[1] / APPS_PATH / yaml_file
+        with open(source, encoding='utf-8') as f:
+            expected = safe_load(f)
+
+        assert namespace[constant] == expected
+        assert repr(namespace[constant]) == repr(expected)
+
+    def test_sassy_load_config_bad_format(self, message_service):
         """load_config raise ParserError."""
-        config = Config(message=self.message)
-        yaml_file = \
-            Path(self.TESTS_DIR / 'test_sassy.py').resolve().as_posix()
-        result = config.load_config(config_file=yaml_file)
+        config = Config(message=message_service)
+        result = config.load_config(config_file=Path(__file__))
         assert result.err.code == 400
 
-    def test_sassy_load_config_file_not_found(self):
+    def test_sassy_load_config_file_not_found(self, message_service):
         """load_config raise FileNotFoundError."""
         config_file = 'bad_file'
-        config = Config(message=self.message)
+        config = Config(message=message_service)
         result = config.load_config(config_file=config_file)
         assert result.err.code == 401
 
@@ -271,102 +432,74 @@ class TestSassy:
              'fake_file': '"""THis is a content."""'
          }, ['fake_file', '"""THis is a content."""'])
     ])
-    def test_get_file_dto_ok(self, files, expected):
+    def test_get_file_dto_ok(self, sassy, files, expected):
         """Get a File DTO."""
-        sassy = Sassy(
-            apps='fakesassy', message=self.message, repo=self.repo)
         file: File = sassy._get_file_dto(files=files)
         assert file.name == expected[0]
         assert file.content == expected[1]
 
-    @mark.parametrize('idx, files', [
-        (0, 123),
-        (1, True),
-        (2, False),
-        (3, [123]),
-        (4, None),
-    ])
-    def test_get_file_dto_not_ok(self, idx, files):
+    @mark.parametrize('files', [123, True, False, [123], None, {}], ids=[
+        'int', 'true', 'false', 'list', 'none', 'empty_dict'])
+    def test_get_file_dto_not_ok(self, sassy, files):
         """Get None."""
-        sassy = Sassy(
-            apps='fakesassy', message=self.message, repo=self.repo)
         file: File = sassy._get_file_dto(files=files)
         assert file is None
 
-    def test__get_struct_dto_not_ok(self):
+    def test__get_struct_dto_not_ok(self, patched_config):
         """Invalid yaml file or missing keyword. Result is []"""
-        yaml_load = {'kw': 'invalid'}
-        patcher = patch(f'{APPS_PATH}.load')
-        mock_cfg = patcher.start()
-        mock_cfg.return_value = yaml_load
-        sassy = Sassy(
-            apps='fakesassy', message=self.message, repo=self.repo)
+        sassy = patched_config({'kw': 'invalid'})
         result = sassy._get_struct_dto()
         assert not result
-        patcher.stop()
 
-    def test__get_struct_dto_ok(self):
+    def test__get_struct_dto_ok(self, patched_config, yaml_load):
         """Valid yaml file. Result is list of Struct DTO"""
-        patcher = patch(f'{APPS_PATH}.load')
-        mock_cfg = patcher.start()
-        mock_cfg.return_value = self.yaml_load
-        sassy = Sassy(
-            apps='fakesassy', message=self.message, repo=self.repo)
+        sassy = patched_config(yaml_load)
         result = sassy._get_struct_dto()
         assert result[0].name == 'apps'
         assert result[0].dirs == ['apps_dir_1', 'apps_dir_2']
         assert result[0].files == [File(name='fake_file')]
-        patcher.stop()
 
-    def test__get_struct_dto_field_args_ok(self):
+    def test__get_struct_dto_field_args_ok(self, patched_config, yaml_load):
         """Valid yaml file. Result is list of Struct DTO"""
-        patcher = patch(f'{APPS_PATH}.load')
-        mock_cfg = patcher.start()
-        mock_cfg.return_value = self.yaml_load
-        sassy = Sassy(
-            apps='fakesassy', message=self.message, repo=self.repo)
+        sassy = patched_config(yaml_load)
         result = sassy._get_struct_dto(field='features')
         assert result[0].name == 'apps'
         assert result[0].dirs == ['apps',]
         assert result[0].files == [File(name='__123__.py')]
-        patcher.stop()
 
-    def test__get_struct_dto_field_args_invalid_ko(self):
+    def test__get_struct_dto_field_args_invalid_ko(
+            self, patched_config, yaml_load):
         """Valid yaml file. Result is an empty list"""
-        patcher = patch(f'{APPS_PATH}.load')
-        mock_cfg = patcher.start()
-        mock_cfg.return_value = self.yaml_load
-        sassy = Sassy(
-            apps='fakesassy', message=self.message, repo=self.repo)
+        sassy = patched_config(yaml_load)
         result = sassy._get_struct_dto(field='bad')
         assert isinstance(result, list)
         assert not result
-        patcher.stop()
 
-    def test__get_feature_structure_dto_not_ok(self):
+    def test__get_feature_structure_dto_not_ok(self, patched_config):
         """Invalid yaml file or missing keyword. Result is []"""
-        yaml_load = {'kw': 'invalid'}
-        patcher = patch(f'{APPS_PATH}.load')
-        mock_cfg = patcher.start()
-        mock_cfg.return_value = yaml_load
-        sassy = Sassy(
-            apps='fakesassy', message=self.message, repo=self.repo)
+        sassy = patched_config({'kw': 'invalid'})
         result = sassy._get_feature_structure_dto()
         assert not result
-        patcher.stop()
 
-    def test__get_feature_structure_dto_ok(self):
+    def test__get_feature_structure_dto_ok(self, patched_config, yaml_load):
         """Valid yaml file. Result is list of Struct DTO"""
-        patcher = patch(f'{APPS_PATH}.load')
-        mock_cfg = patcher.start()
-        mock_cfg.return_value = self.yaml_load
-        sassy = Sassy(
-            apps='fakesassy', message=self.message, repo=self.repo)
+        sassy = patched_config(yaml_load)
         result = sassy._get_feature_structure_dto()
         assert result[0].name == 'apps'
         assert result[0].dirs == ['apps_dir_1', 'apps_dir_2']
         assert result[0].files == [File(name='__123__.py', content='')]
-        patcher.stop()
+
+    def test__get_struct_dto_cached(self, patched_config, yaml_load):
+        """Datasets are built once and reset when config is reloaded"""
+        sassy = patched_config(yaml_load)
+        structs = sassy._get_struct_dto()
+        features = sassy._get_feature_structure_dto()
+        assert sassy._get_struct_dto() is structs
+        assert sassy._get_feature_structure_dto() is features
+        Config.clear_cache()
+        sassy.load_config(config_file=sassy.config_file)
+        assert sassy._get_struct_dto() is not structs
+        assert sassy._get_feature_structure_dto() is not features
 
     @pytest.mark.parametrize('dirname, directories, expected', [
         ('fake_dir', None, True),
@@ -378,175 +511,264 @@ class TestSassy:
         ('apps', ['*z'], False),
     ])
     def test_is_selected_directory_directories_given_true(
-            self, dirname, directories, expected):
-        patcher = patch(f'{APPS_PATH}.load')
-        mock_cfg = patcher.start()
-        mock_cfg.return_value = self.yaml_load
-
-        sassy = Sassy(
-            apps='fakesassy', message=self.message, repo=self.repo)
+            self, patched_config, yaml_load, dirname, directories, expected):
+        sassy = patched_config(yaml_load)
 
         result = sassy.is_valid_directory(
             directory=dirname, directories=directories)
         assert result is expected
-        patcher.stop()
-
-    def tests_create_dir_already_exist(self):
-        sassy = Sassy(
-            apps='fakesassy', message=self.message, repo=self.repo)
-        sassy.update = False
-        isdir_patcher = patch(f'{APPS_PATH}.Path.is_dir')
-        mock_isdir = isdir_patcher.start()
-        mock_isdir.return_value = True
-        makedir_patcher = patch(f'{APPS_PATH}.Path.mkdir')
-        makedir_patcher.start()
-
-        r = sassy.create_dir(name=Path('fake_name'))
-        isdir_patcher.stop()
-        makedir_patcher.stop()
-        assert r.err.code == 201
-
-    def tests_create_dir_success(self):
-        sassy = Sassy(
-            apps='fakesassy', message=self.message, repo=self.repo)
-        sassy.update = False
-        isdir_patcher = patch(f'{APPS_PATH}.Path.is_dir')
-        mock_isdir = isdir_patcher.start()
-        mock_isdir.return_value = False
-        makedir_patcher = patch(f'{APPS_PATH}.Path.mkdir')
-        makedir_patcher.start()
-
-        r = sassy.create_dir(name=Path('fake_name'))
-        isdir_patcher.stop()
-        makedir_patcher.stop()
-        assert r.ok.code == 102
-
-    def tests_create_dir_success_already_exist(self):
-        sassy = Sassy(
-            apps='fakesassy', message=self.message, repo=self.repo)
-        sassy.update = True
-        isdir_patcher = patch(f'{APPS_PATH}.Path.is_dir')
-        mock_isdir = isdir_patcher.start()
-        mock_isdir.return_value = True
-        makedir_patcher = patch(f'{APPS_PATH}.Path.mkdir')
-        makedir_patcher.start()
-
-        r = sassy.create_dir(name=Path('fake_name'))
-        isdir_patcher.stop()
-        makedir_patcher.stop()
-        assert r.ok.code == 102
-
-    def test_create_dir_success_with_params(self):
-        sassy = Sassy(
-            apps='fakesassy', message=self.message, repo=self.repo)
-        sassy.update = False
-        isdir_patcher = patch(f'{APPS_PATH}.Path.is_dir')
-        mock_isdir = isdir_patcher.start()
-        mock_isdir.return_value = True
-        name = Path('fake_name')
-        sassy.create_dir(name=name)
-        mock_isdir.assert_called_once_with()
-        isdir_patcher.stop()
-
-    def test_create_dir_success_without_params(self):
-        sassy = Sassy(
-            apps='fakesassy', message=self.message, repo=self.repo)
-        sassy.update = False
-        isdir_patcher = patch(f'{APPS_PATH}.Path.is_dir')
-        mock_isdir = isdir_patcher.start()
-        mock_isdir.return_value = True
+
+    @pytest.mark.parametrize('struct_name, dir_name, expected', [
+        ('root', '', 'fakesassy'),
+        ('tests', 'tests/domains', 'fakesassy/tests/domains'),
+        ('clean_arch', 'domains', 'fakesassy/src/domains'),
+    ])
+    def test_build_path(self, sassy, struct_name, dir_name, expected):
+        path = sassy.build_path(struct_name=struct_name, dir_name=dir_name)
+        assert path == Path(expected)
+        assert sassy.build_path(
+            struct_name=struct_name, dir_name=dir_name) is path
+
+    @pytest.fixture
+    def mock_mkdir(self):
+        """Path.mkdir patched."""
+        with patch(f'{APPS_PATH}.Path.mkdir') as mock:
+            yield mock
+
+    @mark.parametrize('update, side_effect, target, kind, code', [
+        (False, None, 'dir', 'ok', 102),
+        (False, FileExistsError, 'dir', 'err', 201),
+        (True, None, 'dir', 'ok', 102),
+        (False, FileNotFoundError, 'dir', 'err', 302),
+        (False, FileExistsError, 'file', 'err', 302),
+        (True, FileExistsError, 'file', 'err', 302),
+    ], ids=['success', 'already_exist', 'update_already_exist', 'failed',
+            'file_exists', 'update_file_exists'])
+    def tests_create_dir(
+            self, sassy, tmp_path, mock_mkdir, update, side_effect, target,
+            kind, code):
+        sassy.update = update
+        name = tmp_path
+
+        if target == 'file':
+            name = tmp_path / 'fake_file'
+            name.write_text('')
+
+        mock_mkdir.side_effect = side_effect
+        r = sassy.create_dir(name=name)
+        mock_mkdir.assert_called_once_with(parents=True, exist_ok=update)
+        assert getattr(r, kind).code == code
+
+    def tests_create_dir_not_a_directory(self, sassy, tmp_path):
+        (tmp_path / 'fake_file').write_text('')
+
+        r = sassy.create_dir(name=tmp_path / 'fake_file' / 'fake_name')
+        assert r.err.code == 302
+        assert 'Not a directory' in r.err.text
+
+    def test_create_dir_success_without_params(self, sassy, mock_mkdir):
         sassy.create_dir()
-        mock_isdir.assert_called_once_with()
-        isdir_patcher.stop()
+        mock_mkdir.assert_called_once_with(parents=True, exist_ok=False)
 
-    def test_create_file_already_exist(self):
+    def test_create_file_already_exist(self, sassy, tmp_path):
         """File is already exist"""
-        sassy = Sassy(
-            apps='fakesassy', message=self.message, repo=self.repo)
-        fake_file = Path('fake/file/path/fake_file.py')
+        fake_file = tmp_path / 'fake_file.py'
+        fake_file.write_text('original')
         content = "Message to write on file to be written"
-        patcher = patch(f'{APPS_PATH}.Path.is_file')
-        mock_isfile = patcher.start()
-        mock_isfile.return_value = True
-        r = sassy.create_file(files={fake_file: content})
+        r = sassy.create_file(file=fake_file, content=content)
         assert r.err.code == 200
-        patcher.stop()
+        assert fake_file.read_text() == 'original'
+
+    def test_create_file_update_already_exist(self, sassy, tmp_path):
+        """File is already exist and overwritten in update mode"""
+        sassy.update = True
+        fake_file = tmp_path / 'fake_file.py'
+        fake_file.write_text('original ' * 10)
+        content = "Message to write on file to be written"
+        r = sassy.create_file(file=fake_file, content=content)
+        assert r.ok.code == 101
+        assert fake_file.read_text() == content + "\n"
 
-    def test_create_file_success_ok(self):
+    def test_create_file_success_ok(self, sassy, tmp_path):
         """Write file ok"""
-        sassy = Sassy(
-            apps='fakesassy', message=self.message, repo=self.repo)
-        fake_file = Path('fake/file/path/fake_file.py')
+        fake_file = tmp_path / 'fake_file.py'
         content = "Message to write on file to be written"
-        touch_patcher = patch(f'{APPS_PATH}.Path.touch')
-        write_patcher = patch(f'{APPS_PATH}.Path.write_text')
-        touch_patcher.start()
-        write_patcher.start()
-        r = sassy.create_file(files={fake_file: content})
-        touch_patcher.stop()
-        write_patcher.stop()
+        r = sassy.create_file(file=fake_file, content=content)
 
         assert r.ok.code == 101
+        assert fake_file.read_text() == content + "\n"
 
-    def test_create_file_failed_raise_exception(self):
-        """Raise exception"""
-        sassy = Sassy(
-            apps='fakesassy', message=self.message, repo=self.repo)
-        fake_file = Path('fake_file.py')
+    def test_create_file_umask_permissions(self, sassy, tmp_path):
+        """The user's umask decides the file permissions"""
+        fake_file = tmp_path / 'fake_file.py'
+        umask = os.umask(0o002)
+
+        try:
+            sassy.create_file(file=fake_file, content='')
+        finally:
+            os.umask(umask)
+
+        assert fake_file.stat().st_mode & 0o777 == 0o664
+
+    def test_create_file_failed_raise_exception(self, sassy, tmp_path):
+        """Raise exception, the parent directory is missing"""
+        fake_file = tmp_path / 'missing' / 'fake_file.py'
         content = "Message to write on file to be written"
-        patcher = patch(f'{APPS_PATH}.Path.touch')
-        mock_open_ = patcher.start()
-        mock_open_.side_effect = Exception('fake_error')
-        r = sassy.create_file(files={fake_file: content})
+        r = sassy.create_file(file=fake_file, content=content)
         assert r.err.code == 301
-        patcher.stop()
 
-    def tests_delete_file_success(self):
-        sassy = Sassy(
-            apps='fakesassy', message=self.message, repo=self.repo)
-        sassy.update = False
-        isfile_patcher = patch(f'{APPS_PATH}.Path.is_file')
-        mock_isfile = isfile_patcher.start()
-        mock_isfile.return_value = True
+    def test_create_files_ok(self, sassy, tmp_path):
+        """Write all files"""
+        files = {tmp_path / 'file_a.py': 'content a', tmp_path / 'b': ''}
+        r = sassy.create_files(files=files)
 
-        os_remove_patcher = patch(f'{APPS_PATH}.Path.unlink')
-        os_remove_patcher.start()
+        assert r.ok.code == 103
+        assert (tmp_path / 'file_a.py').read_text() == 'content a\n'
+        assert (tmp_path / 'b').read_text() == '\n'
 
-        r = sassy.delete_file(file=Path('fake_file_name'))
-        isfile_patcher.stop()
-        os_remove_patcher.stop()
-        assert r.ok.code == 106
+    def test_create_files_already_exist(self, sassy, tmp_path):
+        """A file already exist, nothing is written"""
+        (tmp_path / 'b').write_text('original')
+        files = {tmp_path / 'a': 'new a', tmp_path / 'b': 'new b'}
+        r = sassy.create_files(files=files)
 
-    def tests_delete_file_raise_exception(self):
-        sassy = Sassy(
-            apps='fakesassy', message=self.message, repo=self.repo)
-        sassy.update = False
-        isfile_patcher = patch(f'{APPS_PATH}.Path.is_file')
-        mock_isfile = isfile_patcher.start()
-        mock_isfile.return_value = True
+        assert r.err.code == 200
+        assert not (tmp_path / 'a').exists()
+        assert (tmp_path / 'b').read_text() == 'original'
+
+    def test_create_files_failed(self, sassy, tmp_path):
+        """Parent directory is missing"""
+        files = {tmp_path / 'missing' / 'a': 'content'}
+        r = sassy.create_files(files=files)
+
+        assert r.err.code == 301
+
+    def test_create_files_many_one_failed(self, sassy, tmp_path):
+        """The failed file is reported"""
+        files = {tmp_path / f'file_{i}': f'{i}' for i in range(20)}
+        failed = tmp_path / 'missing' / 'a'
+        files[failed] = 'content'
+        r = sassy.create_files(files=files)
+
+        assert r.err.code == 301
+        assert str(failed) in r.err.text
+
+    def test_create_files_small_batch_inline(self, sassy, tmp_path):
+        """A few files are written without a thread pool"""
+        files = {tmp_path / f'file_{i}': f'{i}' for i in range(8)}
+
+        with patch(f'{APPS_PATH}.ThreadPoolExecutor') as mock:
+            r = sassy.create_files(files=files)
+            mock.assert_not_called()
 
-        os_remove_patcher = patch(f'{APPS_PATH}.Path.unlink')
-        mock_remove = os_remove_patcher.start()
-        mock_remove.side_effect = Exception('fake error')
+        assert r.ok.code == 103
+        assert (tmp_path / 'file_7').read_text() == '7\n'
 
+    def test_create_files_parallel_one_failed(self, sassy, tmp_path):
+        """Above the threshold, files are written from a thread pool"""
+        files = {tmp_path / f'file_{i}': f'{i}' for i in range(4)}
+        failed = tmp_path / 'missing' / 'a'
+        files[failed] = 'content'
+
+        with patch(f'{APPS_PATH}.PARALLEL_WRITE_MIN_FILES', 1), \
+                patch(f'{APPS_PATH}.ThreadPoolExecutor',
+                      wraps=ThreadPoolExecutor) as mock:
+            r = sassy.create_files(files=files)
+            mock.assert_called_once()
+
+        assert r.err.code == 301
+        assert str(failed) in r.err.text
+
+    def test_create_files_parallel_one_directory(self, sassy, tmp_path):
+        """Files in a single directory skip the thread pool"""
+        files = {tmp_path / f'file_{i}': f'{i}' for i in range(4)}
+
+        with patch(f'{APPS_PATH}.PARALLEL_WRITE_MIN_FILES', 1), \
+                patch(f'{APPS_PATH}.ThreadPoolExecutor') as mock:
+            r = sassy.create_files(files=files)
+            mock.assert_not_called()
+
+        assert r.ok.code == 103
+        assert (tmp_path / 'file_3').read_text() == '3\n'
+
+    def test_write_batch_stop_at_failure(self, sassy, tmp_path):
+        """A batch reports its failed file and skips the next ones"""
+        failed = tmp_path / 'missing' / 'a'
+        files = [
+            (tmp_path / 'first', 'first'),
+            (failed, 'content'),
+            (tmp_path / 'last', 'last'),
+        ]
+        file, exc = sassy._write_batch(files=files)
+
+        assert file == failed
+        assert isinstance(exc, FileNotFoundError)
+        assert (tmp_path / 'first').read_text() == 'first\n'
+        assert not (tmp_path / 'last').exists()
+        assert sassy._write_batch(files=files[:1]) is not None
+        sassy.update = True
+        assert sassy._write_batch(files=files[:1]) is None
+
+    @pytest.mark.parametrize('writev', [
+        None,
+        lambda fd, buffers: os.write(fd, buffers[0][:2]),
+    ], ids=['no_writev', 'partial_writev'])
+    def test_create_file_writev_fallback(self, sassy, tmp_path, writev):
+        """Content is complete without writev or after a partial write"""
+        fake_file = tmp_path / 'fake_file.py'
+        content = "Message to write on file to be written"
+
+        with patch(f'{APPS_PATH}.writev', writev):
+            r = sassy.create_file(file=fake_file, content=content)
+
+        assert r.ok.code == 101
+        assert fake_file.read_text() == content + "\n"
+
+    def test_find_existing_file(self, tmp_path):
+        """Only existing files are reported, directories are ignored"""
+        (tmp_path / 'a_dir').mkdir()
+        (tmp_path / 'b_file').write_text('')
+        files = [
+            tmp_path / 'missing' / 'a',
+            tmp_path / 'a_dir',
+            tmp_path / 'new',
+            tmp_path / 'b_file',
+        ]
+        assert Sassy._find_existing_file(files) == tmp_path / 'b_file'
+        assert Sassy._find_existing_file(files[:3]) is None
+
+    @pytest.fixture
+    def mock_is_file(self):
+        """Path.is_file patched."""
+        with patch(f'{APPS_PATH}.Path.is_file') as mock:
+            yield mock
+
+    @pytest.fixture
+    def mock_unlink(self):
+        """Path.unlink patched."""
+        with patch(f'{APPS_PATH}.Path.unlink') as mock:
+            yield mock
+
+    def tests_delete_file_success(self, sassy, mock_is_file, mock_unlink):
+        mock_is_file.return_value = True
         r = sassy.delete_file(file=Path('fake_file_name'))
-        isfile_patcher.stop()
-        os_remove_patcher.stop()
-        assert r.err.code == 303
+        mock_unlink.assert_called_once_with()
+        assert r.ok.code == 106
 
-    def tests_delete_file_file_not_exist(self):
-        sassy = Sassy(
-            apps='fakesassy', message=self.message, repo=self.repo)
-        sassy.update = False
-        isfile_patcher = patch(f'{APPS_PATH}.Path.is_file')
-        mock_isfile = isfile_patcher.start()
-        mock_isfile.return_value = False
+    def tests_delete_file_raise_exception(
+            self, sassy, mock_is_file, mock_unlink):
+        mock_is_file.return_value = True
+        mock_unlink.side_effect = Exception('fake error')
+        r = sassy.delete_file(file=Path('fake_file_name'))
+        assert r.err.code == 303
 
+    def tests_delete_file_file_not_exist(
+            self, sassy, mock_is_file, mock_unlink):
+        mock_is_file.return_value = False
         r = sassy.delete_file(file=Path('fake_file_name'))
+        mock_unlink.assert_not_called()
         assert r.err.code == 203
 
-        isfile_patcher.stop()
-
     def test_replace_content_ok(self):
         """replace ok"""
         content = '"""this is a test for __APPS__."""'
@@ -568,29 +790,70 @@ class TestSassy:
         }
         assert file.replace_content(payload) == expected
 
-    def test_create_structure_ok(self):
-        fake_apps = 'fakesassy'
-        patcher = patch(f'{APPS_PATH}.load')
-        mock_cfg = patcher.start()
-        mock_cfg.return_value = self.yaml_load
+    def test_replace_content_many_keywords_ok(self):
+        """replace all keywords in a single pass"""
+        content = '"""__APPS__ with __FEAT__ and __APPS___ext."""'
+        expected = '"""apps with feat and apps_ext."""'
+        file = File(name='fake', content=content)
+        payload = {
+            '__APPS__': 'apps',
+            '__FEAT__': 'feat',
+            '__APPS___': 'apps_',
+        }
+        assert file.replace_content(payload) == expected
 
+    def test_replace_file_name_ok(self):
+        """replace file name"""
+        file = File(name='test___FEAT__.py')
+        payload = {'__FEAT__': 'feat', '__APPS__': 'apps'}
+        assert file.replace_file_name(payload) == 'test_feat.py'
+
+    def test_replace_keep_template(self):
+        """The File DTO is left untouched, it can be reused"""
+        file = File(name='__FEAT__.py', content='"""Feature: __FEAT__."""')
+        assert file.replace_file_name({'__FEAT__': 'one'}) == 'one.py'
+        assert file.replace_content({'__FEAT__': 'one'}) == \
+            '"""Feature: one."""'
+        assert file.replace_file_name({'__FEAT__': 'two'}) == 'two.py'
+        assert file == File(
+            name='__FEAT__.py', content='"""Feature: __FEAT__."""')
+
+    def test_create_feature_many_features(
+            self, message_service, repo, yaml_load):
+        """Cached DTOs substitute each feature name"""
         result = Result()
         result.ok = 'this is ok'
-        sassy = Sassy(
-            apps=fake_apps, message=self.message, repo=self.repo)
 
-        dir_patcher = patch(f'{APPS_PATH}.Sassy.create_dir')
-        file_patcher = patch(f'{APPS_PATH}.Sassy.create_file')
-        repo_patcher = patch(f'{APPS_PATH}.InitRepo.__call__')
-        mock_create_dir = dir_patcher.start()
+        with patch(f'{APPS_PATH}.load', return_value=yaml_load), \
+                patch(f'{APPS_PATH}.Sassy.create_file',
+                      return_value=result) as mock_create_file:
+            sassy = Sassy(
+                apps='fakesassy', message=message_service, repo=repo)
+            sassy.create_feature(feature='first')
+            sassy.create_feature(feature='second')
+
+        names = [
+            c.kwargs['file'].name for c in mock_create_file.call_args_list]
+        assert set(names[:4]) == {'first.py', 'test_first.py'}
+        assert set(names[4:]) == {'second.py', 'test_second.py'}
+
+    @patch(f'{APPS_PATH}.Sassy.create_dir')
+    @patch(f'{APPS_PATH}.Sassy.create_files')
+    @patch(f'{APPS_PATH}.InitRepo.__call__')
+    def test_create_structure_ok(
+            self, mock_repo, mock_create_file, mock_create_dir,
+            patched_config, yaml_load):
+        fake_apps = 'fakesassy'
+        result = Result()
+        result.ok = 'this is ok'
         mock_create_dir.return_value = result
-        mock_create_file = file_patcher.start()
         mock_create_file.return_value = result
-        repo_patcher.start()
+
+        sassy = patched_config(yaml_load)
         sassy.create_structure()
 
         # from fake yaml file
-        structures = self.yaml_load['structure']
+        structures = yaml_load['structure']
         apps_dirs = structures['apps']['dirs']
         other_dirs = structures['other']['dirs']
         apps_files = structures['apps']['files']
@@ -611,40 +874,74 @@ class TestSassy:
         dir_calls = apps_dir_calls + other_dir_calls + test_dir_calls
         mock_create_dir.assert_has_calls(dir_calls, any_order=True)
 
-        # Create Files
-        apps_file_calls = [
-            call(files={apps_path / apps_dir / file: ''})
-            for file in apps_files for apps_dir in apps_dirs]
-        other_file_calls = [
-            call(files={
-                apps_path / other_dir / other_file: ''})
-            for other_file in other_files for other_dir in other_dirs]
-        file_calls = apps_file_calls + other_file_calls
-        mock_create_file.assert_has_calls(file_calls, any_order=True)
+        # Create Files, one batch per structure
+        apps_file_calls = call(files={
+            apps_path / apps_dir / file: ''
+            for apps_dir in apps_dirs for file in apps_files})
+        other_file_calls = call(files={
+            apps_path / other_dir / other_file: ''
+            for other_dir in other_dirs for other_file in other_files})
+        file_calls = [apps_file_calls, other_file_calls]
+        mock_create_file.assert_has_calls(file_calls)
+        assert mock_create_file.call_count == len(file_calls)
+
+        # Init repo with absolute paths
+        repo_kwargs = mock_repo.call_args.kwargs
+        assert repo_kwargs['repo_name'] == \
+            os.path.abspath(apps_path / apps_dirs[0])
+        assert os.path.abspath(apps_path / apps_dirs[1] / apps_files[0]) \
+            in repo_kwargs['items']
+        assert all(os.path.isabs(item) for item in repo_kwargs['items'])
+
+    def test_create_structure_dirs_once_parents_first(
+            self, message_service, repo):
+        """Duplicated dirs are created once, parents before children.
+
+        The repository still goes in the first directory in config order.
+        """
+        fake_apps = 'fakesassy'
+        yaml_load = {
+            'apps': '__ABC__',
+            'structure': {
+                'tests': {'dirs': ['tests/unit', 'tests', 'tests']},
+                'docs': {'dirs': ['tests']},
+            },
+        }
+        result = Result()
+        result.ok = 'this is ok'
 
-        dir_patcher.stop()
-        file_patcher.stop()
-        patcher.stop()
-        repo_patcher.stop()
+        with patch(f'{APPS_PATH}.load', return_value=yaml_load), \
+                patch(f'{APPS_PATH}.Sassy.create_dir',
+                      return_value=result) as mock_create_dir, \
+                patch(f'{APPS_PATH}.InitRepo.__call__') as mock_repo:
+            sassy = Sassy(
+                apps=fake_apps, message=message_service, repo=repo)
+            sassy.create_structure()
 
-    def test_create_feature_ok(self):
+        tests_path = self.CWD / fake_apps
+        assert mock_create_dir.call_args_list == [
+            call(name=tests_path / 'tests'),
+            call(name=tests_path / 'tests' / 'unit'),
+        ]
+        repo_kwargs = mock_repo.call_args.kwargs
+        assert repo_kwargs['repo_name'] == \
+            os.path.abspath(tests_path / 'tests' / 'unit')
+        assert repo_kwargs['items'] == [os.path.abspath(tests_path / 'tests')]
+
+    @patch(f'{APPS_PATH}.Sassy.create_file')
+    def test_create_feature_ok(
+            self, mock_create_file, patched_config, yaml_load):
         fake_apps = 'fakesassy'
-        patcher = patch(f'{APPS_PATH}.load')
-        mock_cfg = patcher.start()
-        mock_cfg.return_value = self.yaml_load
-
         result = Result()
         result.ok = 'this is ok'
-        sassy = Sassy(apps=fake_apps, message=self.message, repo=self.repo)
-        file_patcher = patch(f'{APPS_PATH}.Sassy.create_file')
-
-        mock_create_file = file_patcher.start()
         mock_create_file.return_value = result
+
+        sassy = patched_config(yaml_load)
         fake_feature = 'fake_feature'
         test_fake_feature = f'test_{fake_feature}'
         sassy.create_feature(feature=fake_feature)
         # from fake yaml file
-        structure = self.yaml_load['structure']
+        structure = yaml_load['structure']
         apps_dirs = structure['apps']['dirs']
         test_dirs = structure['tests']['dirs']
 
@@ -653,56 +950,42 @@ class TestSassy:
         tests_path = self.CWD / fake_apps
 
         apps_dir_calls = [
-            call(files={
-                apps_path/apps_dir/f"{fake_feature}.py": ''})
+            call(
+                file=apps_path/apps_dir/f"{fake_feature}.py", content='')
             for apps_dir in apps_dirs]
         test_dir_calls = [
-            call(files={
-                tests_path/test_dir/f"{test_fake_feature}.py": ''})
+            call(
+                file=tests_path/test_dir/f"{test_fake_feature}.py", content='')
             for test_dir in test_dirs]
         file_calls = apps_dir_calls + test_dir_calls
 
         mock_create_file.assert_has_calls(file_calls, any_order=True)
 
-        file_patcher.stop()
-        patcher.stop()
-
-    def test__get_args_ok(self):
-        fake_apps = 'fakesassy'
-        patcher = patch(f'{APPS_PATH}.load')
-        mock_cfg = patcher.start()
-        mock_cfg.return_value = self.yaml_load
-
-        sassy = Sassy(apps=fake_apps, message=self.message, repo=self.repo)
+    def test__get_args_ok(self, patched_config, yaml_load):
+        sassy = patched_config(yaml_load)
         args = sassy._get_args()
-        assert args == self.yaml_load['args']
-        patcher.stop()
+        assert args == yaml_load['args']
 
     @pytest.mark.parametrize('idx, dirs', [
         (1, ['invalid_dirname']),
         (2, []),
         (3, ['apps_dir_1'])
     ])
-    def test_create_feature__with_kwargs_ok(self, idx, dirs):
+    def test_create_feature__with_kwargs_ok(
+            self, patched_config, yaml_load, idx, dirs):
         fake_apps = 'fakesassy'
-        patcher = patch(f'{APPS_PATH}.load')
-        mock_cfg = patcher.start()
-        mock_cfg.return_value = self.yaml_load
-
         result = Result()
         result.ok = 'this is ok'
-        sassy = Sassy(apps=fake_apps, message=self.message, repo=self.repo)
-        file_patcher = patch(f'{APPS_PATH}.Sassy.create_file')
-
-        mock_create_file = file_patcher.start()
-        mock_create_file.return_value = result
+        sassy = patched_config(yaml_load)
         fake_feature = 'fake_feature'
         test_fake_feature = f'test_{fake_feature}'
         directories = {'directories': dirs}
 
-        sassy.create_feature(feature=fake_feature, **directories)
+        with patch(f'{APPS_PATH}.Sassy.create_file',
+                   return_value=result) as mock_create_file:
+            sassy.create_feature(feature=fake_feature, **directories)
         # from fake yaml file
-        structure = self.yaml_load['structure']
+        structure = yaml_load['structure']
         apps_dirs = structure['apps']['dirs']
         test_dirs = structure['tests']['dirs']
 
@@ -716,17 +999,18 @@ class TestSassy:
             test_dir_calls = []
         elif idx == 2:
             apps_dir_calls = [
-                call(files={
-                    apps_path/apps_dir/f"{fake_feature}.py": ''})
+                call(
+                    file=apps_path/apps_dir/f"{fake_feature}.py", content='')
                 for apps_dir in apps_dirs]
             test_dir_calls = [
-                call(files={
-                    tests_path/test_dir/f"{test_fake_feature}.py": ''})
+                call(
+                    file=tests_path/test_dir/f"{test_fake_feature}.py",
+                    content='')
                 for test_dir in test_dirs]
         elif idx == 3:
             apps_dir_calls = [
-                call(files={
-                    apps_path/apps_dir/f"{fake_feature}.py": ''})
+                call(
+                    file=apps_path/apps_dir/f"{fake_feature}.py", content='')
                 for apps_dir in dirs]
             test_dir_calls = []
 
@@ -734,25 +1018,20 @@ class TestSassy:
 
         mock_create_file.assert_has_calls(file_calls, any_order=True)
 
-        file_patcher.stop()
-        patcher.stop()
-
-    def test_delete_feature_ok(self):
+    @patch(f'{APPS_PATH}.Sassy.delete_file')
+    def test_delete_feature_ok(
+            self, mock_delete_file, patched_config, yaml_load):
         fake_apps = 'fakesassy'
-        patcher = patch(f'{APPS_PATH}.load')
-        mock_cfg = patcher.start()
-        mock_cfg.return_value = self.yaml_load
         result = Result()
         result.ok = 'this is ok'
-        sassy = Sassy(apps=fake_apps, message=self.message, repo=self.repo)
-        file_patcher = patch(f'{APPS_PATH}.Sassy.delete_file')
-        mock_delete_file = file_patcher.start()
         mock_delete_file.return_value = result
+
+        sassy = patched_config(yaml_load)
         sassy.delete_feature(feature='fake_feature')
 
         fake_feature = 'fake_feature'
         test_fake_feature = f'test_{fake_feature}'
-        structure = self.yaml_load['structure']
+        structure = yaml_load['structure']
         apps_dirs = structure['apps']['dirs']
         test_dirs = structure['tests']['dirs']
         apps_path = self.CWD / fake_apps / self.FAKE_APPS
@@ -767,32 +1046,27 @@ class TestSassy:
         file_calls = apps_dir_calls + test_dir_calls
 
         mock_delete_file.assert_has_calls(file_calls, any_order=True)
-        file_patcher.stop()
-        patcher.stop()
 
     @pytest.mark.parametrize('idx, dirs', [
         (1, ['invalid_dirname']),
         (2, []),
         (3, ['apps_dir_1'])
     ])
-    def test_delete_feature_with_kwargs_ok(self, idx, dirs):
+    def test_delete_feature_with_kwargs_ok(
+            self, patched_config, yaml_load, idx, dirs):
         fake_apps = 'fakesassy'
-        patcher = patch(f'{APPS_PATH}.load')
-        mock_cfg = patcher.start()
-        mock_cfg.return_value = self.yaml_load
         result = Result()
         result.ok = 'this is ok'
-        sassy = Sassy(apps=fake_apps, message=self.message, repo=self.repo)
-        file_patcher = patch(f'{APPS_PATH}.Sassy.delete_file')
-        mock_delete_file = file_patcher.start()
-        mock_delete_file.return_value = result
+        sassy = patched_config(yaml_load)
         directories = {'directories': dirs}
 
-        sassy.delete_feature(feature='fake_feature', **directories)
+        with patch(f'{APPS_PATH}.Sassy.delete_file',
+                   return_value=result) as mock_delete_file:
+            sassy.delete_feature(feature='fake_feature', **directories)
 
         fake_feature = 'fake_feature'
         test_fake_feature = f'test_{fake_feature}'
-        structure = self.yaml_load['structure']
+        structure = yaml_load['structure']
         apps_dirs = structure['apps']['dirs']
         test_dirs = structure['tests']['dirs']
         apps_path = self.CWD / fake_apps / self.FAKE_APPS
@@ -819,27 +1093,23 @@ class TestSassy:
         file_calls = apps_dir_calls + test_dir_calls
 
         mock_delete_file.assert_has_calls(file_calls, any_order=True)
-        file_patcher.stop()
-        patcher.stop()
 
-    def test_init_repo_ok(self):
+    def test_init_repo_ok(self, message_service, repo):
         """Init repo and return a commit number."""
         repo_name = 'fake_repo_name'
         items = ['dirs_1', 'files_a']
-        repo = FakeRepoProvider()
-        result = InitRepo(repo=repo, message=self.message)(
+        result = InitRepo(repo=repo, message=message_service)(
             repo_name=repo_name,
             items=items,
         )
         assert result.ok.code == 107
 
-    def test_init_repo_not_ok(self):
+    def test_init_repo_not_ok(self, message_service, repo):
         """Init repo and raise exception."""
         repo_name = 'fake_repo_name'
         items = ['dirs_1', 'files_a']
-        repo = FakeRepoProvider()
         repo.RAISE = Exception('fake error')
-        result = InitRepo(repo=repo, message=self.message)(
+        result = InitRepo(repo=repo, message=message_service)(
             repo_name=repo_name,
             items=items,
         )
@@ -853,25 +1123,74 @@ class TestSassy:
 
         repo_name = 'fake_repo_name'
         items = ['dirs_1', 'files_a']
-        patcher = patch(f'{APPS_PATH}.RepoProvider._git_init')
-        patcher_add = patch(f'{APPS_PATH}.RepoProvider._git_add')
-        patcher_commit = patch(f'{APPS_PATH}.RepoProvider._git_commit')
-        patcher.start()
-        patcher_add.start()
-        mock_git = patcher_commit.start()
-        mock_git.return_value = expected
-        repo = RepoProvider()
-        r = repo.init(repo_name=repo_name, items=items)
+        with patch(f'{APPS_PATH}.RepoProvider._git_init'), \
+                patch(f'{APPS_PATH}.RepoProvider._git_add'), \
+                patch(f'{APPS_PATH}.RepoProvider._git_commit',
+                      return_value=expected):
+            repo = RepoProvider()
+            r = repo.init(repo_name=repo_name, items=items)
         assert r == expected
-        patcher.stop()
-        patcher_add.stop()
-        patcher_commit.stop()
 
     def test_message_provider(self):
         m = MessageService()
         result = m.msg(name='invalid')
         assert result.code == 300
 
+    def test_get_message_service(self, message_service):
+        """One message service for the whole process."""
+        assert get_message_service() is get_message_service()
+        assert get_message_service() is message_service
+
+    def test_message_provider_messages_parsed_once(self):
+        """The message file is parsed once for every instance."""
+        first = MessageService()
+        first.load_messages()
+
+        with patch(f'{APPS_PATH}.load') as mock:
+            second = MessageService()
+            second.load_messages()
+            mock.assert_not_called()
+
+        assert second.messages is first.messages
+
+    def test_message_provider_lazy(self):
+        """The message file is loaded on the first message only."""
+        with patch(f'{APPS_PATH}._load_yaml') as mock:
+            m = MessageService()
+            mock.assert_not_called()
+
+        assert m.msg(name='file_create_ok', extra='abc').code == 101
+
+    def test_message_provider_packaged(self):
+        """The packaged messages pre-parsed at build time are not parsed."""
+        packaged = {'error_msg': {'code': 300, 'text': 'fake'}}
+
+        with patch(f'{APPS_PATH}.PACKAGED_MESSAGES', packaged), \
+                patch(f'{APPS_PATH}.load') as mock:
+            m = MessageService()
+            m.load_messages()
+            mock.assert_not_called()
+
+        assert m.messages is packaged
+
+    def test_message_provider_cached_message_not_shared(self):
+        """Each call builds its own message."""
+        m = MessageService()
+        first = m.msg(name='file_create_failed', extra='abc')
+        first.text += ' fake error'
+        second = m.msg(name='file_create_failed', extra='abc')
+        assert first is not second
+        assert second.text == "Creation of file 'abc' failed!!"
+
+    def test_message_provider_template_cached(self):
+        """Templates are resolved once, extra is formatted per call."""
+        m = MessageService()
+        first = m.msg(name='file_create_failed', extra='abc')
+        second = m.msg(name='file_create_failed', extra='def')
+        assert list(m._templates) == ['file_create_failed']
+        assert first.code == second.code
+        assert second.text == "Creation of file 'def' failed!!"
+
     def test_logger_show_log_debug(self):
         logger = MessageLogger()
         message = Message(code=999, severity='DEBUG')
@@ -915,6 +1234,30 @@ class TestSassy:
             logger.log(message=message)
             mock.assert_called()
 
+    def test_logger_config_loaded_once(self):
+        """logging config is parsed and applied once per process."""
+        MessageLogger()
+        with patch(f'{APPS_PATH}.logging.config.dictConfig') as mock:
+            logger = MessageLogger(show='err')
+            mock.assert_not_called()
+            assert logger.logger is MessageLogger().logger
+
+    @pytest.fixture
+    def root_handler(self):
+        """A handler on the root logger, as set up by an application."""
+        root = logging.getLogger('root')
+        handler = logging.NullHandler()
+        root.addHandler(handler)
+        yield handler
+        root.removeHandler(handler)
+
+    def test_logger_config_existing_handlers(self, root_handler):
+        """logging already set up by the application is kept."""
+        with patch.object(MessageLogger, '_LOGGING_CONFIGURED', False), \
+                patch(f'{APPS_PATH}.logging.config.dictConfig') as mock:
+            MessageLogger()
+            mock.assert_not_called()
+
     def test_repo_provider_git_add(self):
         repo_provider = RepoProvider()
         repo: Repo = Repo